@@ -0,0 +1,105 @@
+"""
+Regression checks for the TXT formatters in wdf_converter.
+
+The numba kernel (`format_tsv_rows`) hand-rolls '%.<precision>f' formatting, so its output is compared byte for
+byte with `np.char.mod`, which uses the C printf rounding the TXT export has always produced.
+
+Run from the repository root with:
+    python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+from typing import Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import wdf_converter  # noqa: E402
+
+
+def expected_rows(shifts: np.ndarray, intensities: np.ndarray, precision: int) -> bytes:
+    """Reference output: '%.<precision>f\\t%.<precision>f\\n' rows formatted by NumPy."""
+    fmt = f'%.{precision}f'
+    rows = zip(np.char.mod(fmt, shifts).tolist(), np.char.mod(fmt, intensities).tolist())
+    return ''.join(f'{shift}\t{inten}\n' for shift, inten in rows).encode('ascii')
+
+
+def sample_values(precision: int) -> np.ndarray:
+    """Values covering ties, signed zeros, rounding carries and both ends of the kernel's range."""
+    rng = np.random.default_rng(precision)
+    scale = 10.0 ** precision
+    values = [
+        0.0, -0.0, 1.0, -1.0, 0.5, -0.5,
+        # Exact binary ties at the last printed digit round half to even
+        0.0625, 0.1875, 2.0 ** -10, 2.0 ** -20, 1023.5 / scale, 1024.5 / scale, -2.5 / scale,
+        # Decimal near-ties, which are not exactly representable and must not be treated as ties
+        1.0005, 2.675, 0.145, 1.5 / scale, -1.5 / scale, 123.4565,
+        # Carries into the integer part
+        9.9999995, 99.9999999, 0.9999999, -0.9999999,
+        # Largest values the kernel formats itself
+        999999999.0, 999999999.4999, -999999999.0,
+    ]
+    values.extend(rng.uniform(-1e4, 1e4, 500))
+    values.extend(rng.uniform(0, 65535, 500))
+    values.extend(np.round(rng.uniform(-1e3, 1e3, 500) * scale) / scale + 0.5 / scale)
+    return np.array(values, dtype=np.float64)
+
+
+@unittest.skipIf(wdf_converter.format_tsv_rows is None, 'numba is not installed')
+class FormatTsvRowsTest(unittest.TestCase):
+
+    def format_rows(self, shifts: np.ndarray, intensities: np.ndarray, precision: int) -> Tuple[int, bytes]:
+        out = np.empty(shifts.size * wdf_converter._TSV_ROW_MAX_BYTES, dtype=np.uint8)
+        n_bytes = wdf_converter.format_tsv_rows(shifts, intensities, out, precision)
+        return n_bytes, out[:max(n_bytes, 0)].tobytes()
+
+    def test_matches_printf(self):
+        for dtype in (np.float64, np.float32):
+            for precision in range(3, 7):
+                with self.subTest(dtype=dtype.__name__, precision=precision):
+                    values = sample_values(precision).astype(dtype)
+                    # 999999999.0 rounds to 1e9 in float32, which the kernel leaves to the NumPy formatter
+                    values = values[np.abs(values) < 1e9]
+                    shifts = values[::-1].copy()
+                    n_bytes, payload = self.format_rows(shifts, values, precision)
+                    self.assertGreaterEqual(n_bytes, 0)
+                    self.assertEqual(payload, expected_rows(shifts, values, precision))
+
+    def test_unsupported_values_fall_back(self):
+        shifts = np.array([100.0, 200.0])
+        for value in (1e9, -1e9, 1e20, np.nan, np.inf, -np.inf):
+            with self.subTest(value=value):
+                intensities = np.array([1.0, value])
+                n_bytes, _ = self.format_rows(shifts, intensities, 6)
+                self.assertEqual(n_bytes, -1)
+                # The NumPy formatter used instead produces the same rows as printf
+                payload = wdf_converter._format_spectrum_txt(
+                    shifts, intensities, 6, wdf_converter.format_raman_shifts(shifts, 6),
+                    row_buffer=np.empty(shifts.size * wdf_converter._TSV_ROW_MAX_BYTES, dtype=np.uint8),
+                )
+                self.assertEqual(bytes(payload), expected_rows(shifts, intensities, 6))
+
+    def test_rejects_mismatched_lengths(self):
+        shifts = np.linspace(0.0, 10.0, 12)
+        out = np.empty(shifts.size * wdf_converter._TSV_ROW_MAX_BYTES, dtype=np.uint8)
+        with self.assertRaises(ValueError):
+            wdf_converter.format_tsv_rows(shifts, np.ones(10), out, 6)
+        with self.assertRaises(ValueError):
+            wdf_converter.format_tsv_rows(shifts, np.ones(12), out[:10], 6)
+
+
+class FormatTsvPayloadTest(unittest.TestCase):
+
+    def test_matches_printf(self):
+        for precision in range(3, 7):
+            with self.subTest(precision=precision):
+                values = np.append(sample_values(precision), [np.nan, np.inf, 1e9, -1e12])
+                shifts = values[::-1].copy()
+                shifts_str = wdf_converter.format_raman_shifts(shifts, precision)
+                payload = wdf_converter.format_tsv_payload(shifts_str, values, precision)
+                self.assertEqual(payload, expected_rows(shifts, values, precision))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 """
 --------------------------------------------------------------------------------------------------------------------
-Convert Renishaw WDF files to per-spectrum TXT files or single CSV files.
+Convert Renishaw WDF files to per-spectrum TXT files, single CSV files or binary NPY files.
 --------------------------------------------------------------------------------------------------------------------
 positional arguments:
   import_dir_path           Directory containing WDF files
@@ -8,17 +8,23 @@ positional arguments:
 
 options:
   -h, --help                show this help message and exit
-  -f, --format {txt,csv}
-                            Export format: txt (default) or csv
+  -f, --format {txt,csv,npy}
+                            Export format: txt (default), csv or npy
+  -p, --precision {3,4,5,6}
+                            Decimal places for txt/csv output (default: 6 for txt, full precision for csv)
+  --dtype {float32,int16}   Intensity dtype for npy output (default: float32)
+  -j, --jobs JOBS           Number of WDF files converted in parallel (default: number of CPUs)
   -v, --verbose             Enable verbose logging
   -m, --mirror              Mirror import directory structure into export directory (default: False)
   -r, --recursive           Search for .wdf files recursively (default: False)
+  -s, --single-file         Write all spectra of a WDF file into a single TXT file (default: False)
 
 --------------------------------------------------------------------------------------------------------------------
 Requirements
 --------------------------------------------------------------------------------------------------------------------
 Installation:
-    pip install renishawWiRE tqdm numpy pandas
+    pip install renishawWiRE tqdm numpy
+    pip install numba    # optional, faster TXT export
 
 --------------------------------------------------------------------------------------------------------------------
 Examples
@@ -45,19 +51,78 @@ Stem                 stem	                    The filename without the extension
 Suffix               extension                  The file extension including the dot (corresponds to .suffix).
 
 """
+import math
 import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from contextlib import nullcontext
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Union, Tuple
+from typing import Dict, Iterator, List, Optional, Union, Tuple
 
 import argparse
 import logging
 import sys
 
 import numpy as np
-import pandas as pd
 from renishawWiRE import WDFReader
 from tqdm import tqdm
 
+try:
+    # Optional: compiled TXT formatter
+    import numba
+except ImportError:
+    numba = None
+
+logger = logging.getLogger('wdf2txt')
+
+
+def iter_filenames(
+        dir_path: str,
+        patterns: Optional[Union[List[str], str]] = None,
+        recursive: bool = True,
+    ) -> Iterator[str]:
+    """Lazily yield filenames in a directory, optionally filtering by filetype and recursion level.
+
+    Takes the same arguments as `get_filenames`. Each directory's entries are visited in name order and
+    sub-directories are descended into as they are reached, so only the listings of the directories on
+    the current path are held in memory. The order is close to, but not exactly, that of `get_filenames`.
+
+    Examples
+    --------
+    >>> for filename in iter_filenames('/path/to/dir', patterns='.wdf'):
+    ...     print(filename)
+    /path/to/dir/file1.wdf
+    /path/to/dir/subdir/file2.wdf
+    """
+    suffixes: Optional[set] = None
+    if patterns:
+        # Suffixes are matched case-insensitively, so '.wdf' also finds '.WDF' files
+        suffixes = {p.lower() for p in (patterns if isinstance(patterns, list) else [patterns])}
+
+    def sorted_entries(current_dir_path: str) -> List[os.DirEntry]:
+        with os.scandir(current_dir_path) as entries:
+            return sorted(entries, key=lambda entry: entry.name)
+
+    # Walk the tree once with os.scandir, testing each file against all patterns at the same time.
+    # scandir reports entry types from the directory listing, so entries are not stat'ed once per pattern.
+    # Errors listing the top directory propagate to the caller.
+    stack: List[Iterator[os.DirEntry]] = [iter(sorted_entries(str(Path(dir_path))))]
+    while stack:
+        entry: Optional[os.DirEntry] = next(stack[-1], None)
+        if entry is None:
+            stack.pop()
+        elif entry.is_dir(follow_symlinks=False):
+            if recursive:
+                try:
+                    stack.append(iter(sorted_entries(entry.path)))
+                except OSError:
+                    # Unreadable sub-directories are skipped
+                    continue
+        elif entry.is_file():
+            if suffixes is None or os.path.splitext(entry.name)[1].lower() in suffixes:
+                yield entry.path
+
+
 def get_filenames(
         dir_path: str,
         patterns: Optional[Union[List[str], str]] = None,
@@ -71,7 +136,7 @@ def get_filenames(
         The directory path to search in.
     patterns: str or list of str, optional
         The file extension(s) to filter by. If None, all files are returned.
-        Must include the leading dot, e.g., '.txt' or ['.txt', '.csv'].
+        Must include the leading dot, e.g., '.txt' or ['.txt', '.csv']. Matching is case-insensitive.
     recursive: bool, optional
         If True (default), search all child directories. If False, only search the top directory.
 
@@ -88,33 +153,8 @@ def get_filenames(
     >>> get_filenames('/path/to/dir', patterns=['.txt', '.csv'], recursive=True)
     ['/path/to/dir/file1.txt', '/path/to/dir/subdir/file2.csv']
     """
-    path_obj: Path = Path(dir_path)
-    found_files: List[Path] = []
-
-    if recursive:
-        # Use rglob for recursive searching (like os.walk)
-        patterns: str = patterns if patterns else "*"
-
-        for pattern in (patterns if isinstance(patterns, list) else [patterns]):
-            if not pattern.startswith('*'):
-                pattern = f'*{pattern}'
-            # Use path_obj.rglob to recursively search
-            found_files.extend(path_obj.rglob(pattern))
-    else:
-        # Use glob or iterdir for non-recursive searching in the top level only
-        # iterdir gets immediate children, we filter for files only
-        found_files = (p for p in path_obj.iterdir() if p.is_file())
-        
-        if patterns:
-            # Further filter by file extension if specified
-            found_files = (
-                p for p in found_files
-                if p.suffix in (patterns if isinstance(patterns, list) else [patterns])
-            )
-            
-    # Convert Path objects to string representation and sort for deterministic order
-    files = [str(file) for file in found_files]
-    return sorted(files)
+    # Sort for deterministic order; cheap, as iter_filenames already yields nearly sorted paths
+    return sorted(iter_filenames(dir_path, patterns=patterns, recursive=recursive))
 
 
 def mirror_dir_path_tree(
@@ -125,91 +165,550 @@ def mirror_dir_path_tree(
 
     Only directories are created; files are not copied. The function is idempotent.
     """
-    for root, dirs, _ in os.walk(import_dir_path):
-        rel = os.path.relpath(root, start=import_dir_path)
-        if rel == '.':
-            rel = ''
-        target = os.path.join(export_dir_path, rel)
-        os.makedirs(target, exist_ok=True)
+    # Collect relative directory paths with an explicit scandir DFS; dirent types avoid a stat per entry
+    rel_dirs: List[str] = ['']
+    stack: List[str] = [import_dir_path]
+    while stack:
+        dir_path = stack.pop()
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    # Symlinked directories are neither mirrored nor followed
+                    if entry.is_dir(follow_symlinks=False):
+                        rel_dirs.append(os.path.relpath(entry.path, start=import_dir_path))
+                        stack.append(entry.path)
+        except OSError:
+            continue
+
+    # Create parents before children so each makedirs call issues a single mkdir
+    for rel in sorted(rel_dirs, key=lambda d: d.count(os.sep)):
+        os.makedirs(os.path.join(export_dir_path, rel), exist_ok=True)
+
+
+@lru_cache(maxsize=16)
+def _format_raman_shifts_cached(
+        shifts_bytes: bytes,
+        dtype: str,
+        precision: int,
+    ) -> np.ndarray:
+    """Format a raw raman shift axis once per worker process; see `format_raman_shifts`."""
+    shifts_str: np.ndarray = np.char.mod(f'%.{precision}f', np.frombuffer(shifts_bytes, dtype=dtype))
+    shifts_str.setflags(write=False)
+    return shifts_str
+
+
+def format_raman_shifts(
+        raman_shifts: np.ndarray,
+        precision: int = 6,
+    ) -> np.ndarray:
+    """Format a raman shift axis with `precision` decimal places, reusing the result across WDF files.
+
+    WDF files acquired with the same settings share an identical axis, so the formatted strings are
+    memoized on the exact axis contents and only computed once per distinct axis. The returned array
+    is read-only as it may be shared between calls.
+    """
+    raman_shifts = np.ascontiguousarray(raman_shifts)
+    return _format_raman_shifts_cached(raman_shifts.tobytes(), raman_shifts.dtype.str, precision)
+
+
+# Upper bound on bytes per formatted TXT row: two '-123456789.123456' values, a tab and a newline
+_TSV_ROW_MAX_BYTES: int = 40
+
+if numba is not None:
+    @numba.njit(cache=True, boundscheck=False, nogil=True)
+    def _write_fixed(out: np.ndarray, pos: int, value: float, precision: int) -> int:
+        """Write `value` as '%.<precision>f' ASCII into `out` at `pos`; return the new position, or -1 if unsupported.
+
+        `precision` must be between 0 and 6.
+        """
+        v = float(value)
+        # Larger values could overflow the int64 digits below and would need a wider row buffer
+        if not math.isfinite(v) or abs(v) >= 1e9:
+            return -1
+        if math.copysign(1.0, v) < 0.0:
+            out[pos] = 45  # '-'
+            pos += 1
+            v = -v
+
+        # Round v * 10**precision to the nearest integer exactly like '%f' (round half to even on the true
+        # value). The product is rounded to a double, so recover its rounding error with Dekker's TwoProduct;
+        # the scale fits in 26 bits, so it needs no splitting.
+        scale_int = np.int64(10) ** precision
+        scale = float(scale_int)
+        p = v * scale
+        c = 134217729.0 * v
+        v_hi = c - (c - v)
+        v_lo = v - v_hi
+        err = ((v_hi * scale - p) + v_lo * scale)
+        scaled = np.rint(p)
+        if abs(p - scaled) == 0.5 and err != 0.0:
+            scaled = math.floor(p) + 1.0 if err > 0.0 else math.floor(p)
+
+        q = np.int64(scaled)
+        int_part = q // scale_int
+        frac_part = q % scale_int
+
+        # Integer digits, most significant first
+        n_digits = 1
+        div = np.int64(1)
+        while int_part // (div * 10) > 0:
+            div *= 10
+            n_digits += 1
+        for _ in range(n_digits):
+            out[pos] = 48 + (int_part // div) % 10
+            pos += 1
+            div //= 10
+
+        if precision == 0:
+            return pos
+        out[pos] = 46  # '.'
+        pos += 1
+        div = scale_int // 10
+        for _ in range(precision):
+            out[pos] = 48 + (frac_part // div) % 10
+            pos += 1
+            div //= 10
+        return pos
+
+    @numba.njit(cache=True, boundscheck=False, nogil=True)
+    def format_tsv_rows(shifts: np.ndarray, intens: np.ndarray, out: np.ndarray, precision: int = 6) -> int:
+        """Format (raman shift, intensity) rows as '%.<precision>f' ASCII pairs directly into `out`.
+
+        `intens` must have the same length as `shifts`, and `out` must hold at least
+        `len(shifts) * _TSV_ROW_MAX_BYTES` bytes. Returns the number of bytes written, or -1 if a value is
+        not finite or too large, in which case `format_tsv_payload` should be used instead. Raises
+        ValueError if the arrays do not fit.
+        """
+        n = shifts.shape[0]
+        # Bounds checks are off in the loop below, so check the sizes once up front
+        if intens.shape[0] != n:
+            raise ValueError("shifts and intens must have the same length")
+        if out.shape[0] < n * _TSV_ROW_MAX_BYTES:
+            raise ValueError("out is too small for the formatted rows")
+        pos = 0
+        for i in range(n):
+            pos = _write_fixed(out, pos, shifts[i], precision)
+            if pos < 0:
+                return -1
+            out[pos] = 9  # tab
+            pos += 1
+            pos = _write_fixed(out, pos, intens[i], precision)
+            if pos < 0:
+                return -1
+            out[pos] = 10  # newline
+            pos += 1
+        return pos
+else:
+    format_tsv_rows = None
+
+
+def format_tsv_payload(
+        shifts_str: np.ndarray,
+        intensities: np.ndarray,
+        precision: int = 6,
+        row_prefixes: Optional[np.ndarray] = None,
+    ) -> bytes:
+    """Format spectra as tab-separated rows of (raman shift, intensity, ...).
+
+    Equivalent to `np.savetxt(..., fmt=f'%.{precision}f', delimiter='\\t')`, but the formatting is vectorized
+    and the result is returned as a single bytes payload so it can be written in one call.
+
+    Parameters
+    ----------
+    shifts_str: np.ndarray
+        Pre-formatted raman shifts, e.g. from `format_raman_shifts(raman_shifts, precision)`.
+    intensities: np.ndarray
+        1D array of intensities for a single spectrum, or a 2D array of shape
+        (n_points, n_spectra) with one spectrum per column.
+    precision: int, optional
+        Number of decimal places written for each intensity (default 6).
+    row_prefixes: np.ndarray, optional
+        `shifts_str` with the tab delimiter already appended. Pass this when formatting many spectra
+        with the same axis so the shift column is not rebuilt for every spectrum; 1D input only.
+
+    Returns
+    -------
+    bytes
+        ASCII encoded rows, each terminated by a newline.
+    """
+    inten_str: np.ndarray = np.char.mod(f'%.{precision}f', intensities)
+    if inten_str.ndim == 1:
+        if row_prefixes is None:
+            row_prefixes = np.char.add(shifts_str, '\t')
+        lines: np.ndarray = np.char.add(row_prefixes, inten_str)
+        return ('\n'.join(lines.tolist()) + '\n').encode('ascii')
+
+    rows = (
+        '\t'.join([shift, *row])
+        for shift, row in zip(shifts_str.tolist(), inten_str.tolist())
+    )
+    return ('\n'.join(rows) + '\n').encode('ascii')
+
+
+def _load_wdf(
+        wdf_dir_path: str,
+    ) -> Union[Tuple[np.ndarray, np.ndarray], Tuple[None, str]]:
+    """Read a single WDF file into its raman shifts and a 2D intensity array.
+
+    Returns (raman_shifts, intensities) where `intensities` is a C-contiguous array of shape
+    (n_spectra, points_per_spectrum), or (None, error_message) if the file could not be opened or its
+    raman shift axis does not match the spectra.
+    """
+    try:
+        reader: WDFReader = WDFReader(wdf_dir_path)
+    except Exception as exc:
+        return None, f"Failed to open: {type(exc).__name__}: {exc}"
+
+    raman_shifts: np.ndarray = np.ascontiguousarray(reader.xdata)
+    intensities: np.ndarray = np.asarray(reader.spectra)
+
+    if intensities.ndim != 2:
+        # Reshape intensities to 2D array (n_spectra, points_per_spectrum); a view for contiguous input
+        try:
+            intensities = intensities.reshape((reader.count, reader.point_per_spectrum))
+        except Exception:
+            n_points: int = intensities.size // max(1, getattr(reader, 'count', 1))
+            intensities: np.ndarray = intensities.reshape((getattr(reader, 'count', 1), n_points))
+
+    # Every exporter pairs the axis with each spectrum point by point
+    if raman_shifts.size != intensities.shape[1]:
+        return None, f"Raman shift axis has {raman_shifts.size} points but spectra have {intensities.shape[1]}"
+
+    # Per-spectrum rows must be contiguous for fast vectorized formatting; copies at most once
+    intensities = np.ascontiguousarray(intensities)
+
+    return raman_shifts, intensities
+
+
+def _format_spectrum_txt(
+        raman_shifts: np.ndarray,
+        intensities: np.ndarray,
+        precision: int,
+        shifts_str: np.ndarray,
+        row_prefixes: Optional[np.ndarray] = None,
+        row_buffer: Optional[np.ndarray] = None,
+    ) -> Union[bytes, np.ndarray]:
+    """Format a single spectrum as TXT rows of (raman shift, intensity).
+
+    When `row_buffer` is given, the numba kernel reads the shift axis and the spectrum row in place and emits
+    ASCII into it, and a view of the written bytes is returned; it is only valid until the buffer is reused.
+    Falls back to `format_tsv_payload` otherwise, or if the kernel cannot format a value.
+    """
+    if intensities.shape[0] != raman_shifts.shape[0]:
+        raise ValueError(
+            f"Raman shift axis has {raman_shifts.shape[0]} points but spectrum has {intensities.shape[0]}"
+        )
+
+    if row_buffer is not None:
+        n_bytes: int = format_tsv_rows(raman_shifts, intensities, row_buffer, precision)
+        if n_bytes >= 0:
+            return row_buffer[:n_bytes]
+    return format_tsv_payload(shifts_str, intensities, precision, row_prefixes)
+
+
+# Number of values formatted per block by the single-file TXT and the CSV writers
+_FORMAT_BLOCK_CELLS: int = 1 << 18
+
 
 def extract_and_save_spectra_to_txt(
         wdf_dir_path: str,
         txt_export_dir_path: str,
+        txt_single_file: bool = False,
+        precision: int = 6,
+        create_dir: bool = True,
     ) -> Tuple[int, Optional[str]]:
     """Read a single WDF file and save each spectrum as a separate text file.
 
     Parameters
     - wdf_dir_path: path to input WDF file
     - txt_export_dir_path: directory where per-spectrum files will be written
+    - txt_single_file: if True, write all spectra into one `<stem>.txt` file inside `txt_export_dir_path`
+      instead. The first column holds the raman shifts and each subsequent column one spectrum, so only
+      one file (and inode) is created per WDF rather than one per spectrum.
+    - precision: number of decimal places written for raman shifts and intensities (0 to 6, default 6)
+    - create_dir: if True (default), create `txt_export_dir_path` first; pass False when it already exists
 
     Returns the number of spectra written (0 on error).
     """
-    logger = logging.getLogger('wdf2txt')
-    try:
-        reader: WDFReader = WDFReader(wdf_dir_path)
-    except Exception as exc:
-        return 0, f"Failed to open: {type(exc).__name__}: {exc}"
+    raman_shifts, intensities = _load_wdf(wdf_dir_path)
+    if raman_shifts is None:
+        # On failure the second element holds the error message
+        return 0, intensities
 
-    raman_shifts: np.ndarray = np.asarray(reader.xdata)
-    intensities: np.ndarray = np.asarray(reader.spectra)
+    n_spectra: int = int(intensities.shape[0])
+
+    if create_dir:
+        os.makedirs(txt_export_dir_path, exist_ok=True)
+
+    # Format the shared raman shift column once for all spectra (and all files with the same axis)
+    shifts_str: np.ndarray = format_raman_shifts(raman_shifts, precision)
+
+    if txt_single_file:
+        # Save all spectra as columns of a single txt file
+        stem, _ = os.path.splitext(os.path.basename(wdf_dir_path))
+        txt_export_filename: str = os.path.join(txt_export_dir_path, f"{stem}.txt")
+        # Format a block of rows (raman shifts) at a time, so the intermediate strings stay bounded
+        # at roughly _FORMAT_BLOCK_CELLS values however large the map is
+        n_points: int = int(intensities.shape[1])
+        block_rows: int = max(1, _FORMAT_BLOCK_CELLS // max(1, n_spectra))
+        try:
+            with open(txt_export_filename, 'wb', buffering=1 << 20) as f:
+                for start in range(0, n_points, block_rows):
+                    stop: int = start + block_rows
+                    f.write(format_tsv_payload(shifts_str[start:stop], intensities[:, start:stop].T, precision))
+        except Exception as exc:
+            return 0, f"Failed to write TXT: {type(exc).__name__}: {exc}"
+        return n_spectra, None
+
+    # Format each spectrum on this thread and write files on background threads, so disk writes overlap with
+    # formatting the next spectrum. Formatting stays on one thread, as files are already converted by one
+    # worker process per CPU. The number of in-flight payloads is bounded to keep memory use flat on large maps.
+    max_pending: int = 64
+    # In-flight writes, each mapped to the scratch buffer holding its payload (None for NumPy payloads)
+    pending: Dict[Future, Optional[np.ndarray]] = {}
+    # Scratch buffers of finished writes, reused for later spectra, so at most `max_pending` are allocated
+    free_buffers: List[np.ndarray] = []
+    row_buffer_size: int = raman_shifts.size * _TSV_ROW_MAX_BYTES
+
+    # Hoisted out of the spectrum loop: the shift column with its delimiter for the NumPy formatter
+    row_prefixes: Optional[np.ndarray] = None
+    if format_tsv_rows is None:
+        row_prefixes = np.char.add(shifts_str, '\t')
 
     try:
-        # Reshape intensities to 2D array (n_spectra, points_per_spectrum)
-        intensities = np.reshape(intensities, (reader.count, reader.point_per_spectrum))
-    except Exception:
-        if intensities.ndim == 2:
-            intensities: np.ndarray = intensities
-        else:
-            n_points: int = intensities.size // max(1, getattr(reader, 'count', 1))
-            intensities: np.ndarray = intensities.reshape((getattr(reader, 'count', 1), n_points))
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for idx in range(n_spectra):
+                # Save each spectrum as a separate txt file
+                txt_export_filename: str = os.path.join(txt_export_dir_path, f"{idx}.txt")
+                row_buffer: Optional[np.ndarray] = None
+                if format_tsv_rows is not None:
+                    row_buffer = free_buffers.pop() if free_buffers else np.empty(row_buffer_size, dtype=np.uint8)
+                payload = _format_spectrum_txt(
+                    raman_shifts, intensities[idx], precision, shifts_str, row_prefixes, row_buffer,
+                )
+                # The payload is handed to the writer thread as is; a numba payload is a view of row_buffer,
+                # which is not reused until the write has finished
+                pending[executor.submit(Path(txt_export_filename).write_bytes, payload)] = row_buffer
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                        row_buffer = pending.pop(future)
+                        if row_buffer is not None:
+                            free_buffers.append(row_buffer)
+            for future in as_completed(pending):
+                future.result()
+    except Exception as exc:
+        return 0, f"Failed to write TXT: {type(exc).__name__}: {exc}"
 
-    n_spectra: int = int(intensities.shape[0])
+    return n_spectra, None
 
-    os.makedirs(txt_export_dir_path, exist_ok=True)
 
-    for idx in range(n_spectra):
-        # Save each spectrum as a separate txt file
-        txt_export_filename: str = os.path.join(txt_export_dir_path, f"{idx}.txt")
-        data: np.ndarray = np.column_stack((raman_shifts, intensities[idx]))
-        np.savetxt(txt_export_filename, data, fmt='%.6f', delimiter='\t')
+def _write_csv(
+        raman_shifts: np.ndarray,
+        intensities: np.ndarray,
+        csv_export_filename: str,
+        precision: Optional[int] = None,
+    ) -> None:
+    """Write `intensities`, one spectrum per row, with a raman shift header row to `csv_export_filename`.
 
-    return n_spectra, None
+    Raises on failure; see `extract_and_save_spectra_to_csv`.
+    """
+    if precision is None:
+        header: List[str] = [str(s) for s in raman_shifts]
+    else:
+        header: List[str] = format_raman_shifts(raman_shifts, precision).tolist()
+
+    # A 1 MiB buffer coalesces the header and body chunks into large write syscalls
+    with open(csv_export_filename, 'wb', buffering=1 << 20) as f:
+        f.write((','.join(header) + '\n').encode('ascii'))
+
+        # Format a block of spectra at a time with NumPy, bounding the string arrays to roughly
+        # _FORMAT_BLOCK_CELLS values. astype(str) gives the shortest round-trip representation, as pandas'
+        # to_csv did.
+        chunk_size: int = max(1, _FORMAT_BLOCK_CELLS // max(1, intensities.shape[1]))
+        for start in range(0, intensities.shape[0], chunk_size):
+            chunk: np.ndarray = intensities[start:start + chunk_size]
+            if precision is None:
+                chunk_str: np.ndarray = chunk.astype(str)
+            else:
+                chunk_str: np.ndarray = np.char.mod(f'%.{precision}f', chunk)
+            # Missing values are written as empty fields
+            chunk_str[np.isnan(chunk)] = ''
+            f.write(('\n'.join(','.join(row) for row in chunk_str.tolist()) + '\n').encode('ascii'))
 
 
 def extract_and_save_spectra_to_csv(
         wdf_dir_path: str,
         csv_export_filename: str,
+        precision: Optional[int] = None,
     ) -> Tuple[int, Optional[str]]:
     """Read a single WDF file and save all spectra into a single CSV file.
 
+    Values are formatted with a vectorized NumPy writer.
+    `precision` limits the number of decimal places written; by default values are written at full precision.
+
     Returns 1 on success, 0 on failure.
     """
-    logger = logging.getLogger('wdf2txt')
+    raman_shifts, intensities = _load_wdf(wdf_dir_path)
+    if raman_shifts is None:
+        # On failure the second element holds the error message
+        return 0, intensities
+
     try:
-        reader: WDFReader = WDFReader(wdf_dir_path)
+        # The writer reads blocks of rows, so the C-contiguous array from _load_wdf is used as-is, without
+        # a staging copy
+        _write_csv(raman_shifts, intensities, csv_export_filename, precision)
     except Exception as exc:
-        return 0, f"Failed to open: {type(exc).__name__}: {exc}"
+        return 0, f"Failed to write CSV: {type(exc).__name__}: {exc}"
 
-    raman_shifts = np.asarray(reader.xdata)
-    spectra = np.asarray(reader.spectra)
+    return 1, None
 
-    try:
-        intensities = np.reshape(spectra, (reader.count, reader.point_per_spectrum))
-    except Exception:
-        if spectra.ndim == 2:
-            intensities = spectra
-        else:
-            points = spectra.size // max(1, getattr(reader, 'count', 1))
-            intensities = spectra.reshape((getattr(reader, 'count', 1), points))
 
+def extract_and_save_spectra_to_npy(
+        wdf_dir_path: str,
+        npy_export_filename: str,
+        dtype: str = 'float32',
+    ) -> Tuple[int, Optional[str]]:
+    """Read a single WDF file and save all spectra as a binary NumPy `.npy` file.
+
+    The intensities are saved to `npy_export_filename` as a (n_spectra, points_per_spectrum) array of
+    `dtype` ('float32' or 'int16'), and the raman shifts next to it as `<stem>_raman_shifts.npy`.
+    Intensities are rounded for 'int16', and files with non-finite intensities or intensities outside
+    the int16 range fail rather than being coerced.
+
+    Returns 1 on success, 0 on failure.
+    """
+    raman_shifts, intensities = _load_wdf(wdf_dir_path)
+    if raman_shifts is None:
+        # On failure the second element holds the error message
+        return 0, intensities
+
+    if dtype == 'int16':
+        # NaN would pass the range check below and be cast to 0
+        if not np.isfinite(intensities).all():
+            return 0, "Non-finite intensities cannot be stored as int16"
+        info = np.iinfo(np.int16)
+        if intensities.size and (intensities.min() < info.min or intensities.max() > info.max):
+            return 0, "Intensities out of int16 range"
+        intensities = np.rint(intensities)
+
+    stem, _ = os.path.splitext(npy_export_filename)
     try:
-        df = pd.DataFrame(intensities, columns=raman_shifts)
-        df.to_csv(csv_export_filename, index=False)
+        np.save(npy_export_filename, intensities.astype(dtype, copy=False))
+        np.save(f"{stem}_raman_shifts.npy", raman_shifts)
     except Exception as exc:
-        return 0, f"Failed to write CSV: {type(exc).__name__}: {exc}"
+        return 0, f"Failed to write NPY: {type(exc).__name__}: {exc}"
 
     return 1, None
 
+
+EXPORT_FORMATS: Tuple[str, ...] = ('txt', 'csv', 'npy')
+
+
+def _export_paths(
+        wdf: str,
+        import_root: str,
+        export_root: str,
+        fmt: str,
+        mirror: bool,
+        txt_single_file: bool = False,
+    ) -> Tuple[str, str]:
+    """Return (export_path, export_dir_path) for converting `wdf` into `export_root` as `fmt`.
+
+    `export_path` is the per-spectrum folder for TXT exports and the output filename otherwise;
+    `export_dir_path` is the directory that must exist before the export is written.
+    """
+    stem, _ = os.path.splitext(os.path.basename(wdf))
+
+    rel_dir = os.path.relpath(os.path.dirname(wdf), start=import_root)
+    if rel_dir == '.':
+        rel_dir = ''
+    export_dir_path = os.path.join(export_root, rel_dir) if mirror else export_root
+
+    if fmt.lower() == 'txt':
+        if txt_single_file:
+            # A single-file export is written next to where the per-spectrum folder would be
+            return export_dir_path, export_dir_path
+        txt_export_subdir = os.path.join(export_dir_path, stem)
+        return txt_export_subdir, txt_export_subdir
+    return os.path.join(export_dir_path, f"{stem}.{fmt.lower()}"), export_dir_path
+
+
+def _convert_one(
+        wdf: str,
+        import_root: str,
+        export_root: str,
+        fmt: str,
+        mirror: bool,
+        txt_single_file: bool = False,
+        precision: Optional[int] = None,
+        dtype: str = 'float32',
+    ) -> Tuple[str, int, Optional[str]]:
+    """Convert a single WDF file into `export_root` using export format `fmt`.
+
+    Runs in a worker process, so only picklable arguments (strings, ints and bools) are passed in.
+    The output directory must already exist; `run_conversion` creates all of them up front.
+
+    Returns (basename, written, err); `err` is None on success. Unexpected exceptions are returned as `err`
+    rather than raised, so one bad file cannot abort the whole run.
+    """
+    basename = os.path.basename(wdf)
+    try:
+        return _convert_one_unchecked(
+            wdf, import_root, export_root, fmt, mirror, txt_single_file, precision, dtype,
+        )
+    except Exception as exc:
+        return basename, 0, f"Unexpected error: {type(exc).__name__}: {exc}"
+
+
+def _convert_one_unchecked(
+        wdf: str,
+        import_root: str,
+        export_root: str,
+        fmt: str,
+        mirror: bool,
+        txt_single_file: bool,
+        precision: Optional[int],
+        dtype: str,
+    ) -> Tuple[str, int, Optional[str]]:
+    """Body of `_convert_one`, which catches anything raised here."""
+    basename = os.path.basename(wdf)
+    export_path, _ = _export_paths(wdf, import_root, export_root, fmt, mirror, txt_single_file)
+
+    if fmt.lower() == 'txt':
+        # run_conversion has already created the output directory
+        written, err = extract_and_save_spectra_to_txt(
+            wdf, export_path, txt_single_file, 6 if precision is None else precision, create_dir=False,
+        )
+        if written == 0 and err is None:
+            err = "No spectra written"
+        return basename, written, err
+    elif fmt.lower() == 'csv':
+        written, err = extract_and_save_spectra_to_csv(wdf, export_path, precision)
+        if written == 0 and err is None:
+            err = "CSV write failed"
+        return basename, written, err
+    elif fmt.lower() == 'npy':
+        written, err = extract_and_save_spectra_to_npy(wdf, export_path, dtype)
+        if written == 0 and err is None:
+            err = "NPY write failed"
+        return basename, written, err
+    else:
+        return basename, 0, f"Unknown export format: {fmt}"
+
+
+def _future_result(
+        future: Future,
+        wdf: str,
+    ) -> Tuple[str, int, Optional[str]]:
+    """Return the result of a `_convert_one` future, turning pool failures (e.g. a crashed worker) into `err`."""
+    try:
+        return future.result()
+    except Exception as exc:
+        return os.path.basename(wdf), 0, f"Worker failed: {type(exc).__name__}: {exc}"
+
+
 def run_conversion(
         wdf_import_dir_path: str,
         txt_export_dir_path: str,
@@ -217,16 +716,23 @@ def run_conversion(
         mirror: bool = False,
         recursive: bool = False,
         verbose: bool = False,
+        txt_single_file: bool = False,
+        precision: Optional[int] = None,
+        dtype: str = 'float32',
+        jobs: Optional[int] = None,
     ) -> Tuple[int, List[str]]:
     """Convert all WDF files found under `wdf_import_dir` into `txt_export_dir`.
 
-    `export_format` may be 'txt' (default) or 'csv'.
+    `export_format` may be 'txt' (default), 'csv' or 'npy'.
     `mirror` controls whether the import directory tree is mirrored under the export directory (default False).
     `recursive` controls whether to search for .wdf files recursively (default False).
+    `txt_single_file` writes one multi-column TXT file per WDF instead of one file per spectrum (default False).
+    `precision` sets the decimal places for txt/csv output (default None: 6 for txt, full precision for csv).
+    `dtype` sets the intensity dtype for npy output, 'float32' (default) or 'int16'.
+    `jobs` sets the number of worker processes (default None: one per CPU); 1 converts files sequentially in-process.
 
     Returns (successful_count, failed_basenames).
     """
-    logger = logging.getLogger('wdf2txt')
 
     if not os.path.isdir(wdf_import_dir_path):
         raise FileNotFoundError(f"Import directory does not exist: {wdf_import_dir_path}")
@@ -253,75 +759,67 @@ def run_conversion(
 
     n_wdf_filenames: int = len(wdf_filenames)
 
-    # Setup progress indicator
-    use_tqdm = tqdm is not None
-    pbar = tqdm(total=n_wdf_filenames) if use_tqdm else None
-
-    for idx, wdf in enumerate(wdf_filenames):
-        basename = os.path.basename(wdf)
-        stem, _ = os.path.splitext(basename)
-        # Update progress bar or simple progress line
-        if pbar is not None:
-            pbar.set_description(f"{basename}")
-            pbar.update(1)
-        else:
-            print(f"Progress: {idx+1}/{n_wdf_filenames} - {basename}")
-        if verbose:
-            logger.info(f"Converting [{idx+1}/{n_wdf_filenames}]: {basename} as {export_format}")
-
-        rel_dir = os.path.relpath(os.path.dirname(wdf), start=wdf_import_dir_path)
-        if rel_dir == '.':
-            rel_dir = ''
-
-        if export_format.lower() == 'txt':
-            if mirror:
-                txt_export_subdir = os.path.join(txt_export_dir_path, rel_dir, stem)
-            else:
-                txt_export_subdir = os.path.join(txt_export_dir_path, stem)
+    # Create every output directory once, parents first, rather than once per file
+    dir_errors: dict = {}
+    if export_format.lower() in EXPORT_FORMATS:
+        export_dir_paths = {
+            _export_paths(wdf, wdf_import_dir_path, txt_export_dir_path, export_format, mirror, txt_single_file)[1]
+            for wdf in wdf_filenames
+        }
+        for dir_path in sorted(export_dir_paths, key=lambda d: d.count(os.sep)):
             try:
-                os.makedirs(txt_export_subdir, exist_ok=True)
+                os.makedirs(dir_path, exist_ok=True)
             except OSError as exc:
-                err = f"OS error creating output dir: {exc}"
-                failed.setdefault(err, []).append(basename)
+                dir_errors[dir_path] = f"OS error creating output dir: {exc}"
+
+    # Files whose output directory could not be created fail without being converted
+    pending_filenames: List[str] = []
+    for wdf in wdf_filenames:
+        if dir_errors:
+            _, dir_path = _export_paths(
+                wdf, wdf_import_dir_path, txt_export_dir_path, export_format, mirror, txt_single_file,
+            )
+            if dir_path in dir_errors:
+                failed.setdefault(dir_errors[dir_path], []).append(os.path.basename(wdf))
                 if verbose:
-                    logger.error("%s", err)
+                    logger.error("%s", dir_errors[dir_path])
                 continue
+        pending_filenames.append(wdf)
+    n_skipped: int = n_wdf_filenames - len(pending_filenames)
 
-            written, err = extract_and_save_spectra_to_txt(wdf, txt_export_subdir)
-            if written > 0:
-                success_count += 1
-            else:
-                if err is None:
-                    err = "No spectra written"
-                failed.setdefault(err, []).append(basename)
-                if verbose:
-                    logger.error("%s", err)
-        elif export_format.lower() == 'csv':
-            if mirror:
-                csv_filename = os.path.join(txt_export_dir_path, rel_dir, f"{stem}.csv")
+    # Setup progress indicator
+    use_tqdm = tqdm is not None
+    # Cap redraw cost: no terminal width polling and at most five refreshes per second
+    pbar = tqdm(total=n_wdf_filenames, initial=n_skipped, dynamic_ncols=False, mininterval=0.2) if use_tqdm else None
+
+    convert_args = (wdf_import_dir_path, txt_export_dir_path, export_format, mirror, txt_single_file, precision, dtype)
+    # A single job runs in this process, avoiding worker start-up and pickling overhead
+    # max_workers=None lets the executor pick one worker per CPU, capped where the platform requires it
+    with nullcontext() if jobs == 1 else ProcessPoolExecutor(max_workers=jobs) as executor:
+        if executor is None:
+            results = (_convert_one(wdf, *convert_args) for wdf in pending_filenames)
+        else:
+            futures = {executor.submit(_convert_one, wdf, *convert_args): wdf for wdf in pending_filenames}
+            results = (_future_result(future, futures[future]) for future in as_completed(futures))
+
+        for idx, (basename, written, err) in enumerate(results, start=n_skipped):
+            # Update progress bar or simple progress line
+            if pbar is not None:
+                # Only refresh the description every 32 files; each change forces a redraw
+                if idx & 31 == 0:
+                    pbar.set_description(f"{basename}", refresh=False)
+                pbar.update(1)
             else:
-                csv_filename = os.path.join(txt_export_dir_path, f"{stem}.csv")
-            try:
-                os.makedirs(os.path.dirname(csv_filename), exist_ok=True)
-            except OSError as exc:
-                err = f"OS error creating CSV output dir: {exc}"
-                failed.setdefault(err, []).append(basename)
-                if verbose:
-                    logger.error("%s", err)
-                continue
+                print(f"Progress: {idx+1}/{n_wdf_filenames} - {basename}")
+            if verbose:
+                logger.info(f"Converted [{idx+1}/{n_wdf_filenames}]: {basename} as {export_format}")
 
-            written, err = extract_and_save_spectra_to_csv(wdf, csv_filename)
             if written > 0:
                 success_count += 1
             else:
-                if err is None:
-                    err = "CSV write failed"
                 failed.setdefault(err, []).append(basename)
                 if verbose:
                     logger.error("%s", err)
-        else:
-            logger.error("Unknown export format: %s", export_format)
-            failed.append(basename)
 
     if pbar is not None:
         pbar.close()
@@ -340,19 +838,25 @@ def run_conversion(
 
 
 def main() -> None:
-    parser = argparse.ArgumentParser(description='Convert WDF files to per-spectrum TXT files or single CSV files')
+    parser = argparse.ArgumentParser(description='Convert WDF files to per-spectrum TXT files, single CSV files or binary NPY files')
     # Positional arguments
     parser.add_argument('import_dir_path', help='Directory containing WDF files')
     parser.add_argument('export_dir_path', help='Directory to write outputs into')
 
     # Optional arguments
-    parser.add_argument('-f', '--format', type=str.lower, choices=['txt', 'csv'], default='txt', help='Export format: txt (default) or csv')
+    parser.add_argument('-f', '--format', type=str.lower, choices=EXPORT_FORMATS, default='txt', help='Export format: txt (default), csv or npy')
+    parser.add_argument('-p', '--precision', type=int, choices=range(3, 7), default=None, help='Decimal places for txt/csv output, 3 to 6 (default: 6 for txt, full precision for csv)')
+    parser.add_argument('--dtype', choices=['float32', 'int16'], default='float32', help='Intensity dtype for npy output (default: float32)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='Number of WDF files converted in parallel (default: number of CPUs)')
     
     # Flags
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose logging (default: False)')
     parser.add_argument('-m', '--mirror', action='store_true', help='Mirror import directory structure into export directory (default: False)')
     parser.add_argument('-r', '--recursive', action='store_true', help='Search for .wdf files recursively (default: False)')
+    parser.add_argument('-s', '--single-file', action='store_true', help='Write all spectra of a WDF file into a single TXT file (default: False)')
     args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1')
 
     level = logging.DEBUG if args.verbose else logging.INFO
     logging.basicConfig(level=level, format='%(levelname)s: %(message)s')
@@ -365,6 +869,10 @@ def main() -> None:
             mirror=args.mirror,
             recursive=args.recursive,
             verbose=args.verbose,
+            txt_single_file=args.single_file,
+            precision=args.precision,
+            dtype=args.dtype,
+            jobs=args.jobs,
         )
     except FileNotFoundError as exc:
         print(f"Error: {exc}")